@@ -8,10 +8,15 @@ maxLength, names, and dial codes are left unchanged.
 from __future__ import annotations
 
 import csv
-import re
+import functools
 from pathlib import Path
 from typing import Dict, Tuple
 
+try:
+    import regex as re
+except Exception:
+    import re  # type: ignore[no-redef]
+
 ROOT = Path(__file__).resolve().parents[1]
 DART_FILE = ROOT / "lib" / "countries.dart"
 AUTHORITATIVE_CSV = ROOT / "reports" / "authoritative.csv"
@@ -20,12 +25,19 @@ AUTHORITATIVE_CSV = ROOT / "reports" / "authoritative.csv"
 def load_authoritative(path: Path) -> Dict[str, Tuple[int, int]]:
     data: Dict[str, Tuple[int, int]] = {}
     with path.open("r", encoding="utf-8") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        header = next(r, None)
+        if header is None:
+            return data
+        # Resolve column positions once rather than building a dict per row
+        ci = header.index("code")
+        mi = header.index("min_length")
+        xi = header.index("max_length")
         for row in r:
-            code = row["code"].strip()
             try:
-                min_len = int(row["min_length"])
-                max_len = int(row["max_length"])
+                code = row[ci].strip()
+                min_len = int(row[mi])
+                max_len = int(row[xi])
             except Exception:
                 continue
             if min_len <= 0 or max_len <= 0:
@@ -35,29 +47,53 @@ def load_authoritative(path: Path) -> Dict[str, Tuple[int, int]]:
     return data
 
 
+@functools.lru_cache(maxsize=None)
+def _load_authoritative_at(path: Path, mtime_ns: int) -> Dict[str, Tuple[int, int]]:
+    return load_authoritative(path)
+
+
+def load_authoritative_cached(path: Path) -> Dict[str, Tuple[int, int]]:
+    """
+    Same as load_authoritative, but re-parses the CSV only when its mtime changes.
+    The returned dict is shared between callers and must not be mutated.
+    """
+    path = path.resolve()
+    return _load_authoritative_at(path, path.stat().st_mtime_ns)
+
+
+# Whole Country(...) block; quoted strings are consumed as a unit so names
+# containing parentheses do not end the block early.
+COUNTRY_RE = re.compile(r'Country\((?P<body>(?:[^()"]|"[^"]*")*)\)')
+CODE_RE = re.compile(r'\bcode:\s*"(?P<code>[A-Z]{2})"')
+LEN_RE = re.compile(
+    r"(?P<prefix>\bminLength:\s*)(?P<min>\d+)(?P<sep>\s*,\s*\n\s*maxLength:\s*)(?P<max>\d+)"
+)
+
+
 def update_lengths(dart_source: str, lengths: Dict[str, Tuple[int, int]]) -> str:
     """
     For each Country block, find code: "XX" then replace its minLength/maxLength lines.
     Preserve all other content and formatting.
     """
-    # Regex to find blocks like Country( ... code: "XX", ... minLength: n, maxLength: m, ... )
-    country_re = re.compile(
-        r"(Country\(\s*(?:.|\n)*?code:\s*\"(?P<code>[A-Z]{2})\"\s*,(?:.|\n)*?minLength:\s*)(?P<min>\d+)(\s*,\s*\n\s*maxLength:\s*)(?P<max>\d+)",
-        re.DOTALL,
-    )
 
     def replacer(m: re.Match) -> str:
-        code = m.group("code")
+        body = m.group("body")
+        code_m = CODE_RE.search(body)
         # If we don't have authoritative data, keep as-is
-        if code not in lengths:
+        if code_m is None or code_m.group("code") not in lengths:
             return m.group(0)
-        auth_min, auth_max = lengths[code]
+        auth_min, auth_max = lengths[code_m.group("code")]
         # Skip unknowns / zeros
         if not isinstance(auth_min, int) or auth_min <= 0:
             return m.group(0)
+
+        # Only lengths following the code are considered
+        len_m = LEN_RE.search(body, code_m.end())
+        if len_m is None:
+            return m.group(0)
         try:
-            current_min = int(m.group("min"))
-            current_max = int(m.group("max"))
+            current_min = int(len_m.group("min"))
+            current_max = int(len_m.group("max"))
         except Exception:
             return m.group(0)
 
@@ -72,16 +108,15 @@ def update_lengths(dart_source: str, lengths: Dict[str, Tuple[int, int]]) -> str
         if new_min == current_min and new_max == current_max:
             return m.group(0)
 
-        prefix = m.group(1)
-        sep = m.group(4)
-        # Preserve formatting, update min and/or max values
-        return f"{prefix}{new_min}{sep}{new_max}"
+        # Preserve formatting, update min and/or max values in place
+        new_lengths = f"{len_m.group('prefix')}{new_min}{len_m.group('sep')}{new_max}"
+        return f"Country({body[: len_m.start()]}{new_lengths}{body[len_m.end() :]})"
 
-    return country_re.sub(replacer, dart_source)
+    return COUNTRY_RE.sub(replacer, dart_source)
 
 
 def main() -> int:
-    lengths = load_authoritative(AUTHORITATIVE_CSV)
+    lengths = load_authoritative_cached(AUTHORITATIVE_CSV)
     source = DART_FILE.read_text(encoding="utf-8")
     updated = update_lengths(source, lengths)
     if updated != source:
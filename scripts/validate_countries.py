@@ -12,25 +12,72 @@ from __future__ import annotations
 
 import argparse
 import csv
-import re
+import functools
+import io
+import mmap
+import operator
 import sys
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 try:
-    import phonenumbers
+    import regex as re
 except Exception:
-    phonenumbers = None  # type: ignore[assignment]
+    import re  # type: ignore[no-redef]
 
-try:
-    import pycountry
-except Exception:
-    pycountry = None  # type: ignore[assignment]
+
+# phonenumbers and pycountry carry large metadata tables, so they are imported
+# on first use rather than at startup (e.g. for --help or a parse-only run).
+@functools.lru_cache(maxsize=None)
+def _load_phonenumbers():
+    """
+    Imports phonenumbers on first use. Returns None when it is not installed.
+    """
+    try:
+        import phonenumbers
+    except Exception:
+        return None
+    return phonenumbers
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pycountry():
+    """
+    Imports pycountry on first use. Returns None when it is not installed.
+    """
+    try:
+        import pycountry
+    except Exception:
+        return None
+    return pycountry
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_phone_metadata_class():
+    """
+    Resolves the PhoneMetadata class dynamically for compatibility across
+    phonenumbers versions. Returns None when it cannot be found.
+    """
+    phonenumbers = _load_phonenumbers()
+    if phonenumbers is None:
+        return None
+    cls = getattr(phonenumbers, "PhoneMetadata", None)
+    if cls is not None:
+        return cls
+    try:
+        from phonenumbers.phonemetadata_pb2 import PhoneMetadata as _PBPhoneMetadata  # type: ignore
+        return _PBPhoneMetadata
+    except Exception:
+        pass
+    try:
+        from phonenumbers.phonemetadata import PhoneMetadata as _ModPhoneMetadata  # type: ignore
+        return _ModPhoneMetadata
+    except Exception:
+        return None
 
 
-@dataclass(frozen=True)
-class CountryRow:
+class CountryRow(NamedTuple):
     code: str
     name: str
     dial_code: str
@@ -38,113 +85,158 @@ class CountryRow:
     max_length: int
 
 
+# countries.dart is scanned as UTF-8 bytes straight from an mmap. Every
+# delimiter used below is ASCII, which never occurs inside a multi-byte UTF-8
+# sequence, so only the captured fields need decoding.
+COUNTRY_ENTRY_MARKER = b"Country("
+
+# Fast path: entries in countries.dart always list their fields in the same
+# order, so one anchored pattern with literal separators reads a whole entry
+# without any open-ended gaps.
 COUNTRY_ENTRY_RE = re.compile(
-    r"""
-    Country\(
-        \s*name:\s*"(?P<name>[^"]+)"\s*,       # Country name
-        (?:(?:.|\n)*?)                          # non-greedy up to code
-        code:\s*"(?P<code>[A-Z]{2})"\s*,        # ISO alpha-2 code
-        (?:(?:.|\n)*?)                          # non-greedy up to dialCode
-        dialCode:\s*"(?P<dial>\d+)"\s*,         # Dial code digits
-        (?:(?:.|\n)*?)                          # non-greedy up to min/max
-        minLength:\s*(?P<min>\d+)\s*,\s*
-        maxLength:\s*(?P<max>\d+)\s*,?\s*
-    \)""",
-    re.VERBOSE | re.DOTALL,
+    rb'\s*name:\s*"(?P<name>[^"]+)"\s*,'
+    rb'\s*nameTranslations:\s*\{(?:[^{}"]|"[^"]*")*\}\s*,'
+    rb'\s*flag:\s*"[^"]*"\s*,'
+    rb'\s*code:\s*"(?P<code>[A-Z]{2})"\s*,'
+    rb'\s*dialCode:\s*"(?P<dial>\d+)"\s*,'
+    rb"\s*minLength:\s*(?P<min>\d+)\s*,"
+    rb"\s*maxLength:\s*(?P<max>\d+)\s*,?"
+    rb"\s*\)"
 )
 
+# Fallback for entries in any other field order: isolate the body of the
+# Country(...) block, then look each field up within it. Quoted strings are
+# consumed as a unit so names such as "Cocos (Keeling) Islands" do not
+# terminate the block early.
+COUNTRY_BODY_RE = re.compile(rb'((?:[^()"]|"[^"]*")*)\)')
+NAME_RE = re.compile(rb'\bname:\s*"([^"]+)"')
+CODE_RE = re.compile(rb'\bcode:\s*"([A-Z]{2})"')
+DIAL_RE = re.compile(rb'\bdialCode:\s*"(\d+)"')
+LENGTHS_RE = re.compile(rb"\bminLength:\s*(\d+)\s*,\s*maxLength:\s*(\d+)")
+
+
+def _match_entry_fields(
+    buf: Union[bytes, mmap.mmap], pos: int
+) -> Optional[Tuple[bytes, bytes, bytes, bytes, bytes]]:
+    """
+    Returns (name, code, dial, min, max) for the entry starting at buf[pos:],
+    or None if it is not a complete Country entry.
+    """
+    m = COUNTRY_ENTRY_RE.match(buf, pos)
+    if m is not None:
+        return m.group("name", "code", "dial", "min", "max")
+
+    m = COUNTRY_BODY_RE.match(buf, pos)
+    if m is None:
+        return None
+    block = m.group(1)
+    name_m = NAME_RE.search(block)
+    code_m = CODE_RE.search(block)
+    dial_m = DIAL_RE.search(block)
+    lengths_m = LENGTHS_RE.search(block)
+    if not (name_m and code_m and dial_m and lengths_m):
+        # e.g. the Country class constructor itself
+        return None
+    return (
+        name_m.group(1),
+        code_m.group(1),
+        dial_m.group(1),
+        lengths_m.group(1),
+        lengths_m.group(2),
+    )
+
 
 def parse_countries_dart(dart_path: Path) -> List[CountryRow]:
-    text = dart_path.read_text(encoding="utf-8")
     rows: List[CountryRow] = []
-    for m in COUNTRY_ENTRY_RE.finditer(text):
-        name = m.group("name").strip()
-        code = m.group("code").strip()
-        dial = m.group("dial").strip()
-        min_len = int(m.group("min"))
-        max_len = int(m.group("max"))
-        rows.append(
-            CountryRow(
-                code=code,
-                name=name,
-                dial_code=dial,
-                min_length=min_len,
-                max_length=max_len,
-            )
-        )
+    if dart_path.stat().st_size == 0:
+        # mmap cannot map an empty file
+        raise RuntimeError("No Country(...) entries parsed from countries.dart")
+    with dart_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Only text following a Country( marker can hold an entry, so jump
+        # between markers and skip headers/comments without the regex engine.
+        pos = mm.find(COUNTRY_ENTRY_MARKER)
+        while pos != -1:
+            pos += len(COUNTRY_ENTRY_MARKER)
+            fields = _match_entry_fields(mm, pos)
+            if fields is not None:
+                name, code, dial, min_len, max_len = fields
+                rows.append(
+                    CountryRow(
+                        code=code.decode("ascii"),
+                        name=name.decode("utf-8").strip(),
+                        dial_code=dial.decode("ascii"),
+                        min_length=int(min_len),
+                        max_length=int(max_len),
+                    )
+                )
+            pos = mm.find(COUNTRY_ENTRY_MARKER, pos)
     if not rows:
         raise RuntimeError("No Country(...) entries parsed from countries.dart")
     return rows
 
 
-def write_csv(rows: Iterable[CountryRow], out_path: Path) -> None:
+def _write_buffer(buf: io.StringIO, out_path: Path) -> None:
+    """
+    Writes a fully built CSV buffer to out_path in a single write() call.
+    """
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=["code", "name", "dial_code", "min_length", "max_length"],
-        )
-        w.writeheader()
-        for r in rows:
-            w.writerow(
-                {
-                    "code": r.code,
-                    "name": r.name,
-                    "dial_code": r.dial_code,
-                    "min_length": r.min_length,
-                    "max_length": r.max_length,
-                }
-            )
+        f.write(buf.getvalue())
+
 
+def write_csv(rows: Iterable[CountryRow], out_path: Path) -> None:
+    buf = io.StringIO(newline="")
+    w = csv.writer(buf)
+    w.writerow(("code", "name", "dial_code", "min_length", "max_length"))
+    w.writerows(
+        (r.code, r.name, r.dial_code, r.min_length, r.max_length) for r in rows
+    )
+    _write_buffer(buf, out_path)
 
+
+@functools.lru_cache(maxsize=None)
+def _country_code_for_region(code: str) -> int:
+    return _load_phonenumbers().country_code_for_region(code)
+
+
+@functools.lru_cache(maxsize=512)
 def get_authoritative_row_for_region(code: str) -> Optional[Tuple[str, int, int]]:
     """
     Returns (dial_code_str, min_length, max_length) for a region code using phonenumbers.
     Falls back from general_desc.possible_length to union of fixed_line/mobile when needed.
     """
-    if phonenumbers is None:
+    if _load_phonenumbers() is None:
         raise RuntimeError(
             "Missing dependencies. Install with: pip install phonenumbers pycountry"
         )
-    # Resolve PhoneMetadata class dynamically for compatibility across versions
-    PhoneMetadataClass = getattr(phonenumbers, "PhoneMetadata", None)
-    if PhoneMetadataClass is None:
-        try:
-            from phonenumbers.phonemetadata_pb2 import PhoneMetadata as _PBPhoneMetadata  # type: ignore
-            PhoneMetadataClass = _PBPhoneMetadata
-        except Exception:
-            try:
-                from phonenumbers.phonemetadata import PhoneMetadata as _ModPhoneMetadata  # type: ignore
-                PhoneMetadataClass = _ModPhoneMetadata
-            except Exception:
-                PhoneMetadataClass = None
+    metadata_cls = _resolve_phone_metadata_class()
     try:
-        meta = PhoneMetadataClass.metadata_for_region(code, None) if PhoneMetadataClass else None  # type: ignore[attr-defined]
+        meta = metadata_cls.metadata_for_region(code, None) if metadata_cls else None  # type: ignore[attr-defined]
     except Exception:
         meta = None
 
     if not meta:
         return None
 
-    dial_code = phonenumbers.country_code_for_region(code)
+    dial_code = _country_code_for_region(code)
     if not dial_code or dial_code <= 0:
         return None
 
     # Primary source: general_desc.possible_length
-    lengths: List[int] = list(getattr(meta.general_desc, "possible_length", []) or [])
-    # Clean and filter sentinel -1 if present
-    lengths = [n for n in lengths if isinstance(n, int) and n > 0]
+    # Clean and filter sentinel -1 if present; phonenumbers only yields ints here
+    lengths: List[int] = [
+        n for n in (getattr(meta.general_desc, "possible_length", None) or ()) if n > 0
+    ]
 
-    # Fallback: union of mobile/fixed_line possible lengths if general is empty
+    # Fallback: union of mobile/fixed_line possible lengths if general is empty.
+    # Only min()/max() are taken below, so duplicates and order do not matter.
     if not lengths:
-        fallback_sets: List[int] = []
         for kind in ("mobile", "fixed_line"):
             desc = getattr(meta, kind, None)
             if desc is None:
                 continue
-            pl = getattr(desc, "possible_length", None) or []
-            fallback_sets.extend([n for n in pl if isinstance(n, int) and n > 0])
-        lengths = sorted(set(fallback_sets))
+            pl = getattr(desc, "possible_length", None) or ()
+            lengths.extend(n for n in pl if n > 0)
 
     if not lengths:
         # As a last resort, try global generalDesc pattern length heuristic (rare)
@@ -153,36 +245,68 @@ def get_authoritative_row_for_region(code: str) -> Optional[Tuple[str, int, int]
     return str(dial_code), min(lengths), max(lengths)
 
 
-def resolve_country_name(code: str, fallback_name: str) -> str:
+@functools.lru_cache(maxsize=512)
+def _resolve_name_by_code(code: str) -> Optional[str]:
     """
-    Resolves a canonical English name using pycountry when possible.
+    Looks up a canonical English name for code in pycountry, or None if unknown.
     """
+    pycountry = _load_pycountry()
     if pycountry is None:
-        return fallback_name
+        return None
     try:
         country = pycountry.countries.get(alpha_2=code)
         if country is None:
             # pycountry may not include some territories (e.g., XK)
-            return fallback_name
+            return None
         # Prefer common_name or official_name if available
         for attr in ("common_name", "official_name", "name"):
             if hasattr(country, attr):
                 value = getattr(country, attr)
                 if isinstance(value, str) and value.strip():
                     return value
-        return fallback_name
+        return None
     except Exception:
-        return fallback_name
+        return None
 
 
-def build_authoritative_rows(current_rows: List[CountryRow]) -> List[CountryRow]:
+def resolve_country_name(code: str, fallback_name: str) -> str:
+    """
+    Resolves a canonical English name using pycountry when possible.
+    """
+    name = _resolve_name_by_code(code)
+    return fallback_name if name is None else name
+
+
+def build_authoritative_rows(
+    current_rows: List[CountryRow], jobs: int = 1
+) -> List[CountryRow]:
+    """
+    Looks up authoritative data for each distinct code in current_rows.
+    With jobs > 1 the phonenumbers lookups are fanned out over worker processes;
+    name resolution always runs in the calling process.
+    """
+    codes = [r.code for r in current_rows]
+    unique_rows = current_rows
+    if len(set(codes)) != len(codes):
+        # Keep the first row for each code; countries.dart normally has none
+        # repeated, in which case this pass is skipped entirely.
+        unique_rows = []
+        seen: set[str] = set()
+        for r in current_rows:
+            if r.code in seen:
+                continue
+            seen.add(r.code)
+            unique_rows.append(r)
+        codes = [r.code for r in unique_rows]
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            lookups = list(ex.map(get_authoritative_row_for_region, codes, chunksize=16))
+    else:
+        lookups = [get_authoritative_row_for_region(code) for code in codes]
+
     result: List[CountryRow] = []
-    seen: set[str] = set()
-    for r in current_rows:
-        if r.code in seen:
-            continue
-        seen.add(r.code)
-        lookup = get_authoritative_row_for_region(r.code)
+    for r, lookup in zip(unique_rows, lookups):
         if lookup is None:
             # Keep entry but mark unknowns so they appear in diff
             result.append(
@@ -208,6 +332,11 @@ def build_authoritative_rows(current_rows: List[CountryRow]) -> List[CountryRow]
     return result
 
 
+# Fields that must match between current and authoritative rows, fetched in one
+# C-level call so the comparison is a single tuple compare per row.
+COMPARED_FIELDS = operator.attrgetter("dial_code", "min_length", "max_length")
+
+
 def index_by_code(rows: Iterable[CountryRow]) -> Dict[str, CountryRow]:
     return {r.code: r for r in rows}
 
@@ -215,12 +344,23 @@ def index_by_code(rows: Iterable[CountryRow]) -> Dict[str, CountryRow]:
 def build_diff_rows(
     current_rows: List[CountryRow], authoritative_rows: List[CountryRow]
 ) -> List[Dict[str, str]]:
-    current_by_code = index_by_code(current_rows)
-    auth_by_code = index_by_code(authoritative_rows)
+    pairs: Iterable[Tuple[CountryRow, Optional[CountryRow]]]
+    if len(current_rows) == len(authoritative_rows) and all(
+        cur.code == auth.code for cur, auth in zip(current_rows, authoritative_rows)
+    ):
+        # build_authoritative_rows keeps input order one-to-one for unique codes,
+        # so the rows pair up positionally without indexing either list.
+        pairs = zip(current_rows, authoritative_rows)
+    else:
+        auth_by_code = index_by_code(authoritative_rows)
+        pairs = (
+            (cur, auth_by_code.get(code))
+            for code, cur in index_by_code(current_rows).items()
+        )
 
     diffs: List[Dict[str, str]] = []
-    for code, cur in current_by_code.items():
-        auth = auth_by_code.get(code)
+    for cur, auth in pairs:
+        code = cur.code
         if auth is None:
             diffs.append(
                 {
@@ -238,12 +378,7 @@ def build_diff_rows(
             )
             continue
 
-        has_diff = (
-            cur.dial_code != auth.dial_code
-            or cur.min_length != auth.min_length
-            or cur.max_length != auth.max_length
-        )
-        if has_diff:
+        if COMPARED_FIELDS(cur) != COMPARED_FIELDS(auth):
             diffs.append(
                 {
                     "code": code,
@@ -262,7 +397,6 @@ def build_diff_rows(
 
 
 def write_diff_csv(diff_rows: List[Dict[str, str]], out_path: Path) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
     fieldnames = [
         "code",
         "current_name",
@@ -275,11 +409,11 @@ def write_diff_csv(diff_rows: List[Dict[str, str]], out_path: Path) -> None:
         "authoritative_max_length",
         "note",
     ]
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for row in diff_rows:
-            w.writerow(row)
+    buf = io.StringIO(newline="")
+    w = csv.DictWriter(buf, fieldnames=fieldnames)
+    w.writeheader()
+    w.writerows(diff_rows)
+    _write_buffer(buf, out_path)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -296,6 +430,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         default=str(Path(__file__).resolve().parents[1] / "reports"),
         help="Directory where CSVs will be written",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for authoritative lookups (default: 1)",
+    )
     args = parser.parse_args(argv)
 
     dart_path = Path(args.dart_file).expanduser().resolve()
@@ -309,7 +449,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     current_rows = parse_countries_dart(dart_path)
     write_csv(current_rows, current_csv)
 
-    authoritative_rows = build_authoritative_rows(current_rows)
+    authoritative_rows = build_authoritative_rows(current_rows, jobs=args.jobs)
     write_csv(authoritative_rows, authoritative_csv)
 
     diffs = build_diff_rows(current_rows, authoritative_rows)